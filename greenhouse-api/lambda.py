@@ -27,16 +27,103 @@ This Lambda provides:
 - Threshold management with DynamoDB persistence
 """
 
+import copy
 import json
+import logging
+import math
+import os
+import threading
+import time
 import boto3
 from boto3.dynamodb.conditions import Key
-from datetime import datetime, timedelta
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
-# Initialize AWS services
-dynamodb = boto3.resource('dynamodb')
-sensor_table = dynamodb.Table('greenhouse-sensor-data')
-actuator_table = dynamodb.Table('greenhouse-actuator-commands')
+# Optional accelerators from the dependency layer (see README). Without the
+# layer the function still boots and falls back to pure Python.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    np = None
+    HAS_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Lambda attaches its CloudWatch handler to the root logger. Decision traces
+# are DEBUG - set LOG_LEVEL=DEBUG on the function to see them. Case-insensitive;
+# unknown values fall back to INFO instead of failing the import.
+logger = logging.getLogger()
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').strip().upper()
+logger.setLevel(LOG_LEVEL if isinstance(logging.getLevelName(LOG_LEVEL), int) else logging.INFO)
+
+# Max greenhouses processed in parallel by the EventBridge run
+MAX_WORKERS = 16
+
+# Initialize AWS services once per container. The pool covers MAX_WORKERS
+# greenhouses x 3 concurrent reads; keep-alive and short timeouts let warm
+# containers reuse connections and fail fast on a stuck request.
+boto_config = Config(
+    max_pool_connections=50,
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+    tcp_keepalive=True,
+    connect_timeout=1,
+    read_timeout=3
+)
+dynamodb = boto3.resource('dynamodb', config=boto_config)
+# boto3 resources are not thread-safe, the low-level client is. Everything that
+# runs on the EventBridge thread pools (latest reading, last actuator state,
+# command writes, registry adds) goes through this client.
+dynamodb_client = dynamodb.meta.client
+# Table names can be overridden to cut over to migrated tables (see README)
+SENSOR_TABLE_NAME = os.environ.get('SENSOR_TABLE', 'greenhouse-sensor-data')
+ACTUATOR_TABLE_NAME = os.environ.get('ACTUATOR_TABLE', 'greenhouse-actuator-commands')
+sensor_table = dynamodb.Table(SENSOR_TABLE_NAME)
+actuator_table = dynamodb.Table(ACTUATOR_TABLE_NAME)
+
+# Both tables use a Number sort key 'timestamp' holding epoch milliseconds.
+# API responses convert it back to ISO strings (see ms_to_iso).
+
+# Registry item listing every greenhouse with sensor data (StringSet attribute
+# 'ids', plus 'seeded' once the initial sensor table scan has run). Kept in the
+# actuator table next to the __CONFIG__ item so /greenhouses and the
+# EventBridge run can use a single GetItem instead of a full table scan.
+REGISTRY_KEY = {
+    'greenhouse_id': '__REGISTRY__',
+    'timestamp': 0
+}
+
+# Convert between Python items and DynamoDB JSON for low-level client calls
+serializer = TypeSerializer()
+deserializer = TypeDeserializer()
+
+# Greenhouses this container knows are in the registry (added or read back)
+_registered_greenhouses = set()
+
+# GSI on the actuator table: partition key gh_act ("{greenhouse_id}#{actuator}"),
+# sort key timestamp - returns the last command of one actuator with Limit=1
+ACTUATOR_INDEX = 'gsi_actuator'
+
+# Dashboard polls /latest every few seconds - warm containers answer repeat
+# polls from memory for this many seconds
+LATEST_CACHE_TTL = 2.0
+
+# greenhouse_id -> (time.monotonic() when fetched, reading)
+_latest_cache = {}
 
 # CORS headers for browser access
 CORS_HEADERS = {
@@ -46,6 +133,14 @@ CORS_HEADERS = {
     'Access-Control-Allow-Headers': 'Content-Type'
 }
 
+# Sensors reported in every reading (column order for statistics)
+SENSORS = ('temperature', 'humidity', 'soil_moisture', 'light_intensity')
+
+# Attributes /stats needs from each reading - skips alert lists, metadata, etc.
+STATS_PROJECTION = ', '.join(
+    ['#ts', 'alert_count'] + [f'sensors.{sensor}.#v' for sensor in SENSORS]
+)
+
 # ============================================
 # ACTUATOR CONTROL THRESHOLDS
 # ============================================
@@ -64,52 +159,104 @@ INITIAL_THRESHOLDS = {
     }
 }
 
+# Warm containers reuse the last loaded thresholds for this many seconds
+THRESHOLDS_CACHE_TTL = 60
+
+_THRESHOLDS_CACHE = None
+_THRESHOLDS_CACHE_TS = 0.0
+
+THRESHOLDS_KEY = {
+    'greenhouse_id': '__CONFIG__',
+    'timestamp': 0
+}
+
+
+def read_thresholds_item():
+    """Read thresholds item from DynamoDB as floats. None if not initialized yet."""
+    response = actuator_table.get_item(Key=THRESHOLDS_KEY)
+    
+    if 'Item' in response and 'data' in response['Item']:
+        return decimals_to_float(response['Item']['data'])
+    return None
+
+
+def initialize_thresholds():
+    """
+    Write INITIAL_THRESHOLDS unless another container already did
+    Returns: the thresholds now stored in DynamoDB
+    """
+    if save_thresholds(INITIAL_THRESHOLDS, initialize=True):
+        return copy.deepcopy(INITIAL_THRESHOLDS)
+    
+    # Lost the race (or the write failed) - use whatever is stored now
+    return read_thresholds_item() or copy.deepcopy(INITIAL_THRESHOLDS)
+
+
 def load_thresholds():
-    """Load thresholds from DynamoDB. Initialize DB if empty."""
+    """Load thresholds from DynamoDB (cached per container). Initialize DB if empty."""
+    global _THRESHOLDS_CACHE, _THRESHOLDS_CACHE_TS
+    
+    if _THRESHOLDS_CACHE is not None and time.monotonic() - _THRESHOLDS_CACHE_TS < THRESHOLDS_CACHE_TTL:
+        # Callers may modify the returned dict, so never hand out the cached one
+        return copy.deepcopy(_THRESHOLDS_CACHE)
+    
     try:
-        response = actuator_table.get_item(
-            Key={
-                'greenhouse_id': '__CONFIG__',
-                'timestamp': 'thresholds'
-            }
-        )
+        thresholds = read_thresholds_item()
         
-        if 'Item' in response and 'data' in response['Item']:
-            # Convert Decimal to float
-            thresholds = json.loads(json.dumps(response['Item']['data'], default=decimal_default))
-            print(f"✅ Loaded thresholds from DB: soil_on={thresholds['soil_moisture']['turn_on']}%, soil_off={thresholds['soil_moisture']['turn_off']}%")
-            return thresholds
+        if thresholds is not None:
+            logger.info(
+                "✅ Loaded thresholds from DB: soil_on=%s%%, soil_off=%s%%",
+                thresholds['soil_moisture']['turn_on'],
+                thresholds['soil_moisture']['turn_off']
+            )
+            _THRESHOLDS_CACHE = thresholds
+            _THRESHOLDS_CACHE_TS = time.monotonic()
+            return copy.deepcopy(thresholds)
         else:
             # First time setup - initialize DB with default values
-            print("📋 DB empty - Initializing with default thresholds")
-            save_thresholds(INITIAL_THRESHOLDS)
-            return INITIAL_THRESHOLDS.copy()
+            logger.info("📋 DB empty - Initializing with default thresholds")
+            return initialize_thresholds()
     except Exception as e:
-        print(f"⚠️ Error loading thresholds: {e}")
-        # Try to initialize DB
+        logger.warning("⚠️ Error loading thresholds: %s", e)
+        # Try to initialize DB (never overwrites thresholds that already exist)
         try:
-            save_thresholds(INITIAL_THRESHOLDS)
-            print("✅ Initialized DB with default thresholds after error")
-            return INITIAL_THRESHOLDS.copy()
+            thresholds = initialize_thresholds()
+            logger.info("✅ Initialized DB with default thresholds after error")
+            return thresholds
         except:
-            print("❌ Failed to initialize DB, using in-memory defaults")
-            return INITIAL_THRESHOLDS.copy()
+            logger.error("❌ Failed to initialize DB, using in-memory defaults")
+            return copy.deepcopy(INITIAL_THRESHOLDS)
 
-def save_thresholds(thresholds):
-    """Save thresholds to DynamoDB for persistence"""
+def save_thresholds(thresholds, initialize=False):
+    """
+    Save thresholds to DynamoDB for persistence
+    initialize=True only writes if no thresholds item exists yet, so concurrent
+    cold starts cannot overwrite each other (or values set via the API)
+    """
+    global _THRESHOLDS_CACHE_TS
+    
     try:
-        actuator_table.put_item(
-            Item={
-                'greenhouse_id': '__CONFIG__',
-                'timestamp': 'thresholds',
-                'data': float_to_decimal(thresholds),
-                'updated_at': datetime.utcnow().isoformat() + 'Z'
-            }
-        )
-        print("✅ Saved thresholds to DynamoDB")
+        item = dict(THRESHOLDS_KEY)
+        item['data'] = float_to_decimal(thresholds)
+        item['updated_at'] = to_iso(utc_now())
+        
+        put_kwargs = {'Item': item}
+        if initialize:
+            put_kwargs['ConditionExpression'] = 'attribute_not_exists(greenhouse_id)'
+        
+        actuator_table.put_item(**put_kwargs)
+        # Force the next load_thresholds() to re-read from DynamoDB
+        _THRESHOLDS_CACHE_TS = 0.0
+        logger.info("✅ Saved thresholds to DynamoDB")
         return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            logger.info("ℹ️ Thresholds already initialized by another container")
+        else:
+            logger.error("❌ Error saving thresholds: %s", e)
+        return False
     except Exception as e:
-        print(f"❌ Error saving thresholds: {e}")
+        logger.error("❌ Error saving thresholds: %s", e)
         return False
 
 
@@ -124,15 +271,82 @@ def decimal_default(obj):
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
+def decimals_to_float(obj):
+    """Convert Decimals read from DynamoDB back to floats (single walk, no JSON)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    elif isinstance(obj, dict):
+        return {k: decimals_to_float(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [decimals_to_float(i) for i in obj]
+    return obj
+
+
+def to_json(body):
+    """Serialize a response body (orjson if installed; Decimal via decimal_default)"""
+    if orjson is None:
+        return json.dumps(body, default=decimal_default)
+    return orjson.dumps(
+        body,
+        default=decimal_default,
+        option=orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+
 def response(status_code, body):
     """Build API response with CORS headers"""
     return {
         'statusCode': status_code,
         'headers': CORS_HEADERS,
-        'body': json.dumps(body, default=decimal_default)
+        'body': to_json(body)
     }
 
 
+def utc_now():
+    """Current time as a timezone-aware UTC datetime"""
+    return datetime.now(timezone.utc)
+
+
+def to_iso(dt):
+    """Format a UTC datetime for API responses: 2026-01-01T12:00:00.000000Z"""
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def to_epoch_ms(dt):
+    """UTC datetime -> epoch milliseconds (the stored sort key)"""
+    return int(dt.timestamp() * 1000)
+
+
+def ms_to_iso(ms):
+    """Epoch milliseconds sort key -> ISO string, keeping the API wire format"""
+    return to_iso(datetime.fromtimestamp(int(ms) / 1000, timezone.utc))
+
+
+def with_iso_timestamp(item):
+    """Copy of a stored item with its 'timestamp' sort key as an ISO string"""
+    return {**item, 'timestamp': ms_to_iso(item['timestamp'])}
+
+
+def query_pages(table, **kwargs):
+    """Yield each page of Items from a paginated table query"""
+    while True:
+        result = table.query(**kwargs)
+        yield result.get('Items', [])
+        if 'LastEvaluatedKey' not in result:
+            break
+        kwargs['ExclusiveStartKey'] = result['LastEvaluatedKey']
+
+
+def to_dynamodb(item):
+    """Python item -> DynamoDB JSON (for dynamodb_client calls)"""
+    return {k: serializer.serialize(v) for k, v in item.items()}
+
+
+def from_dynamodb(item):
+    """DynamoDB JSON -> Python item (numbers as Decimal, like the resource API)"""
+    return {k: deserializer.deserialize(v) for k, v in item.items()}
+
+
 def float_to_decimal(obj):
     """Convert floats to Decimal for DynamoDB"""
     if isinstance(obj, float):
@@ -144,67 +358,216 @@ def float_to_decimal(obj):
     return obj
 
 
+# Open the DynamoDB connection (TCP + TLS) during the init phase instead of on
+# the first request, with one read-only GetItem. It uses the shared client so
+# requests reuse the connection. It runs in a thread so init waits at most
+# WARMUP_TIMEOUT seconds, however long the client's retries take. Threshold
+# setup (which may write) stays on the request path.
+WARMUP_TIMEOUT = 2.0
+
+
+def warm_up_dynamodb():
+    """Read-only DynamoDB round-trip; errors are logged, never raised"""
+    try:
+        dynamodb_client.get_item(
+            TableName=ACTUATOR_TABLE_NAME,
+            Key=to_dynamodb(THRESHOLDS_KEY),
+            ProjectionExpression='greenhouse_id'
+        )
+    except Exception as e:
+        logger.warning("⚠️ DynamoDB warm-up failed: %s", e)
+
+
+_warmup_thread = threading.Thread(target=warm_up_dynamodb, daemon=True)
+_warmup_thread.start()
+_warmup_thread.join(WARMUP_TIMEOUT)
+
+
 # ============================================
 # SENSOR DATA ENDPOINTS
 # ============================================
 
 def get_latest_reading(greenhouse_id):
-    """Get most recent sensor reading"""
-    result = sensor_table.query(
-        KeyConditionExpression=Key('greenhouse_id').eq(greenhouse_id),
+    """Get most recent sensor reading (cached per container for LATEST_CACHE_TTL seconds)"""
+    cached = _latest_cache.get(greenhouse_id)
+    if cached and time.monotonic() - cached[0] < LATEST_CACHE_TTL:
+        return cached[1]
+    
+    # Low-level client: also called from the EventBridge thread pools
+    result = dynamodb_client.query(
+        TableName=SENSOR_TABLE_NAME,
+        KeyConditionExpression='greenhouse_id = :gid',
+        ExpressionAttributeValues=to_dynamodb({':gid': greenhouse_id}),
         ScanIndexForward=False,
         Limit=1
     )
     
     if result['Items']:
-        return result['Items'][0]
+        latest = from_dynamodb(result['Items'][0])
+        _latest_cache[greenhouse_id] = (time.monotonic(), latest)
+        return latest
     return None
 
 
-def get_readings_history(greenhouse_id, hours=6):
+def get_readings_history(greenhouse_id, hours=6, now=None):
     """Get sensor readings for time period"""
-    end_time = datetime.utcnow()
+    end_time = now or utc_now()
     start_time = end_time - timedelta(hours=hours)
     
     result = sensor_table.query(
         KeyConditionExpression=
             Key('greenhouse_id').eq(greenhouse_id) &
-            Key('timestamp').between(
-                start_time.isoformat() + 'Z',
-                end_time.isoformat() + 'Z'
-            ),
+            Key('timestamp').between(to_epoch_ms(start_time), to_epoch_ms(end_time)),
         ScanIndexForward=True
     )
     
     return result['Items']
 
 
-def get_statistics(greenhouse_id, hours=24):
-    """Calculate statistics for time period"""
-    readings = get_readings_history(greenhouse_id, hours)
+@njit
+def _stats(arr):
+    """
+    Single pass over an (n_readings, n_sensors) array
+    Returns (5, n_sensors): min, max, sum, count, last value - NaN marks a missing sensor
+    """
+    n_rows, n_cols = arr.shape
+    out = np.empty((5, n_cols), dtype=np.float64)
+    
+    for j in range(n_cols):
+        out[0, j] = np.inf
+        out[1, j] = -np.inf
+        out[2, j] = 0.0
+        out[3, j] = 0.0
+        out[4, j] = np.nan
     
-    if not readings:
+    for i in range(n_rows):
+        for j in range(n_cols):
+            value = arr[i, j]
+            if value != value:  # NaN - sensor missing from this reading
+                continue
+            if value < out[0, j]:
+                out[0, j] = value
+            if value > out[1, j]:
+                out[1, j] = value
+            out[2, j] += value
+            out[3, j] += 1.0
+            out[4, j] = value
+    
+    return out
+
+
+# Compile _stats during the init phase rather than on the first /stats request.
+# No on-disk cache (cache=True): /tmp starts empty on every cold start and the
+# package directory is read-only, so compiling once per container is the floor.
+if HAS_NUMBA:
+    try:
+        _stats(np.zeros((1, len(SENSORS)), dtype=np.float64))
+    except Exception as e:
+        logger.warning("⚠️ Numba warm-up failed: %s", e)
+
+
+def _empty_stats():
+    """Initial accumulator: min, max, sum, count, last value per sensor"""
+    n_cols = len(SENSORS)
+    return [[math.inf] * n_cols, [-math.inf] * n_cols, [0.0] * n_cols, [0.0] * n_cols, [math.nan] * n_cols]
+
+
+def _stats_python(readings):
+    """Pure-Python equivalent of _stats() for one page of readings (no numba)"""
+    out = _empty_stats()
+    
+    for r in readings:
+        sensors = r.get('sensors', {})
+        for j, sensor in enumerate(SENSORS):
+            if sensor not in sensors:
+                continue
+            value = float(sensors[sensor]['value'])
+            out[0][j] = min(out[0][j], value)
+            out[1][j] = max(out[1][j], value)
+            out[2][j] += value
+            out[3][j] += 1.0
+            out[4][j] = value
+    
+    return out
+
+
+def _page_stats(readings):
+    """Per-sensor min, max, sum, count, last value for one page of readings"""
+    if not HAS_NUMBA:
+        return _stats_python(readings)
+    
+    # Extract every sensor value of the page once into a columnar buffer
+    arr = np.fromiter(
+        (
+            float(r['sensors'][sensor]['value']) if sensor in r.get('sensors', {}) else np.nan
+            for r in readings
+            for sensor in SENSORS
+        ),
+        dtype=np.float64,
+        count=len(readings) * len(SENSORS)
+    ).reshape(len(readings), len(SENSORS))
+    
+    return _stats(arr)
+
+
+def _merge_stats(acc, page):
+    """Fold one page of stats into the running accumulator (in place)"""
+    for j in range(len(SENSORS)):
+        acc[0][j] = min(acc[0][j], page[0][j])
+        acc[1][j] = max(acc[1][j], page[1][j])
+        acc[2][j] += page[2][j]
+        acc[3][j] += page[3][j]
+        if page[3][j]:
+            acc[4][j] = page[4][j]
+
+
+def get_statistics(greenhouse_id, hours=24, now=None):
+    """
+    Calculate statistics for time period
+    Streams query pages into running min/max/sum/count - only one page in memory
+    """
+    end_time = now or utc_now()
+    start_time = end_time - timedelta(hours=hours)
+    
+    pages = query_pages(
+        sensor_table,
+        KeyConditionExpression=
+            Key('greenhouse_id').eq(greenhouse_id) &
+            Key('timestamp').between(to_epoch_ms(start_time), to_epoch_ms(end_time)),
+        ProjectionExpression=STATS_PROJECTION,
+        ExpressionAttributeNames={'#ts': 'timestamp', '#v': 'value'},
+        ScanIndexForward=True
+    )
+    
+    acc = _empty_stats()
+    total_readings = 0
+    total_alerts = 0
+    
+    for readings in pages:
+        if not readings:
+            continue
+        
+        _merge_stats(acc, _page_stats(readings))
+        total_readings += len(readings)
+        total_alerts += sum(int(r.get('alert_count', 0)) for r in readings)
+    
+    if not total_readings:
         return None
     
-    sensors = ['temperature', 'humidity', 'soil_moisture', 'light_intensity']
+    mins, maxs, sums, counts, lasts = acc
     stats = {}
     
-    for sensor in sensors:
-        values = [float(r['sensors'][sensor]['value']) for r in readings if sensor in r['sensors']]
-        
-        if values:
+    for i, sensor in enumerate(SENSORS):
+        if counts[i]:
             stats[sensor] = {
-                'min': round(min(values), 2),
-                'max': round(max(values), 2),
-                'avg': round(sum(values) / len(values), 2),
-                'current': values[-1] if values else None
+                'min': round(float(mins[i]), 2),
+                'max': round(float(maxs[i]), 2),
+                'avg': round(float(sums[i] / counts[i]), 2),
+                'current': float(lasts[i])
             }
     
-    # Count alerts
-    total_alerts = sum(int(r.get('alert_count', 0)) for r in readings)
-    
     stats['summary'] = {
-        'total_readings': len(readings),
+        'total_readings': total_readings,
         'total_alerts': total_alerts,
         'period_hours': hours
     }
@@ -212,39 +575,109 @@ def get_statistics(greenhouse_id, hours=24):
     return stats
 
 
-def get_recent_alerts(greenhouse_id, limit=10):
+def get_recent_alerts(greenhouse_id, limit=10, now=None):
     """Get recent alerts"""
-    end_time = datetime.utcnow()
+    end_time = now or utc_now()
     start_time = end_time - timedelta(hours=24)
     
-    result = sensor_table.query(
-        KeyConditionExpression=
+    # FilterExpression is applied after the read, so every row read is billed.
+    # The first page is small (Limit, overshooting for rows without alerts) and
+    # answers the common case; if it falls short, read at most one more page,
+    # which DynamoDB caps at 1 MB - no more than the single unbounded query
+    # this replaced.
+    query_kwargs = {
+        'KeyConditionExpression':
             Key('greenhouse_id').eq(greenhouse_id) &
-            Key('timestamp').gte(start_time.isoformat() + 'Z'),
-        FilterExpression='alert_count > :zero',
-        ExpressionAttributeValues={':zero': 0},
-        ScanIndexForward=False
-    )
+            Key('timestamp').gte(to_epoch_ms(start_time)),
+        'FilterExpression': 'alert_count > :zero',
+        'ExpressionAttributeValues': {':zero': 0},
+        'ScanIndexForward': False,
+        'Limit': max(limit * 4, 40)
+    }
     
     alerts = []
-    for item in result['Items'][:limit]:
-        for alert in item.get('alerts', []):
-            alert['reading_timestamp'] = item['timestamp']
-            alerts.append(alert)
+    readings_with_alerts = 0
+    for _ in range(2):
+        result = sensor_table.query(**query_kwargs)
+        
+        for item in result.get('Items', []):
+            if readings_with_alerts >= limit:
+                break
+            readings_with_alerts += 1
+            for alert in item.get('alerts', []):
+                alert['reading_timestamp'] = ms_to_iso(item['timestamp'])
+                alerts.append(alert)
+        
+        if readings_with_alerts >= limit or 'LastEvaluatedKey' not in result:
+            break
+        
+        query_kwargs['ExclusiveStartKey'] = result['LastEvaluatedKey']
+        del query_kwargs['Limit']
     
     return alerts
 
 
+def register_greenhouse(greenhouse_id):
+    """
+    Add a greenhouse to the registry item (idempotent set-add)
+    Only call for greenhouses that have sensor data
+    """
+    if greenhouse_id in _registered_greenhouses:
+        return
+    
+    try:
+        dynamodb_client.update_item(
+            TableName=ACTUATOR_TABLE_NAME,
+            Key=to_dynamodb(REGISTRY_KEY),
+            UpdateExpression='ADD ids :gid',
+            ExpressionAttributeValues=to_dynamodb({':gid': {greenhouse_id}})
+        )
+        _registered_greenhouses.add(greenhouse_id)
+    except Exception as e:
+        logger.warning("⚠️ Error registering greenhouse %s: %s", greenhouse_id, e)
+
+
 def list_greenhouses():
-    """Get list of all greenhouses with data"""
-    result = sensor_table.scan(
-        ProjectionExpression='greenhouse_id',
-        Select='SPECIFIC_ATTRIBUTES'
-    )
+    """Get list of all greenhouses from the registry item"""
+    result = actuator_table.get_item(Key=REGISTRY_KEY)
+    
+    item = result.get('Item', {})
+    if item.get('seeded'):
+        # Already listed - register_greenhouse() can skip the write for these
+        _registered_greenhouses.update(item.get('ids', ()))
+        return sorted(item.get('ids', set()))
+    
+    # Registry not seeded yet (older deployments) - run a one-off scan of the
+    # sensor table and merge it into whatever was registered meanwhile
+    logger.info("📋 Greenhouse registry not seeded - seeding from sensor table scan")
+    scan_kwargs = {
+        'ProjectionExpression': 'greenhouse_id',
+        'Select': 'SPECIFIC_ATTRIBUTES'
+    }
+    greenhouse_ids = set()
+    while True:
+        result = sensor_table.scan(**scan_kwargs)
+        greenhouse_ids.update(item['greenhouse_id'] for item in result['Items'])
+        if 'LastEvaluatedKey' not in result:
+            break
+        scan_kwargs['ExclusiveStartKey'] = result['LastEvaluatedKey']
     
-    greenhouse_ids = list(set(item['greenhouse_id'] for item in result['Items']))
+    update_kwargs = {
+        'Key': REGISTRY_KEY,
+        'UpdateExpression': 'SET seeded = :true',
+        'ExpressionAttributeValues': {':true': True}
+    }
+    if greenhouse_ids:
+        update_kwargs['UpdateExpression'] = 'ADD ids :ids SET seeded = :true'
+        update_kwargs['ExpressionAttributeValues'][':ids'] = greenhouse_ids
+    
+    try:
+        actuator_table.update_item(**update_kwargs)
+        _registered_greenhouses.update(greenhouse_ids)
+    except Exception as e:
+        logger.warning("⚠️ Error seeding greenhouse registry: %s", e)
     
-    return sorted(greenhouse_ids)
+    return sorted(greenhouse_ids | item.get('ids', set()))
 
 
 # ============================================
@@ -254,31 +687,40 @@ def list_greenhouses():
 def get_last_actuator_state(greenhouse_id, actuator_name):
     """Get the last known state and speed of an actuator"""
     try:
-        response = actuator_table.query(
-            KeyConditionExpression=Key('greenhouse_id').eq(greenhouse_id),
+        response = dynamodb_client.query(
+            TableName=ACTUATOR_TABLE_NAME,
+            IndexName=ACTUATOR_INDEX,
+            KeyConditionExpression='gh_act = :ga',
+            ExpressionAttributeValues=to_dynamodb({':ga': f'{greenhouse_id}#{actuator_name}'}),
             ScanIndexForward=False,
-            Limit=10
+            Limit=1,
+            ProjectionExpression='#s, speed',
+            ExpressionAttributeNames={'#s': 'state'}
         )
+        items = [from_dynamodb(item) for item in response.get('Items', [])]
         
-        for item in response.get('Items', []):
-            if item.get('actuator') == actuator_name:
-                state = item.get('state', 'OFF')
-                speed = item.get('speed', 'OFF')
-                return {'state': state, 'speed': speed}
-        
+        if items:
+            return {
+                'state': items[0].get('state', 'OFF'),
+                'speed': items[0].get('speed', 'OFF')
+            }
         return {'state': 'OFF', 'speed': 'OFF'}
     except Exception as e:
-        print(f"Error getting actuator state: {e}")
+        logger.error("Error getting actuator state: %s", e)
         return {'state': 'OFF', 'speed': 'OFF'}
 
 
-def store_actuator_command(greenhouse_id, actuator_name, state, reason, sensor_values=None, speed=None):
-    """Store actuator command in DynamoDB"""
-    timestamp = datetime.utcnow().isoformat() + 'Z'
+def build_actuator_command(greenhouse_id, actuator_name, state, reason, sensor_values=None, speed=None, timestamp=None):
+    """
+    Build an actuator command item
+    timestamp (epoch ms) is the sort key - it must be unique per greenhouse
+    """
+    timestamp = timestamp or to_epoch_ms(utc_now())
     
     command = {
         'greenhouse_id': greenhouse_id,
         'timestamp': timestamp,
+        'gh_act': f'{greenhouse_id}#{actuator_name}',
         'actuator': actuator_name,
         'state': state,
         'reason': reason,
@@ -289,86 +731,154 @@ def store_actuator_command(greenhouse_id, actuator_name, state, reason, sensor_v
     if speed:
         command['speed'] = speed
     
+    return command
+
+
+def store_actuator_command(greenhouse_id, actuator_name, state, reason, sensor_values=None, speed=None, timestamp=None):
+    """Store actuator command in DynamoDB"""
+    command = build_actuator_command(
+        greenhouse_id, actuator_name, state, reason, sensor_values, speed, timestamp
+    )
+    stored = store_actuator_commands([command])
+    return stored[0] if stored else None
+
+
+def store_actuator_commands(commands):
+    """
+    Store actuator commands in DynamoDB
+    Several commands go in one TransactWriteItems call (one round-trip)
+    Never overwrites an existing command with the same key
+    Returns: list of stored commands (empty on failure)
+    """
+    if not commands:
+        return []
+    
     try:
-        actuator_table.put_item(Item=command)
-        print(f"✅ Stored command: {actuator_name} -> {state}")
-        return command
+        if len(commands) == 1:
+            dynamodb_client.put_item(
+                TableName=ACTUATOR_TABLE_NAME,
+                Item=to_dynamodb(commands[0]),
+                ConditionExpression='attribute_not_exists(#ts)',
+                ExpressionAttributeNames={'#ts': 'timestamp'}
+            )
+        else:
+            dynamodb_client.transact_write_items(
+                TransactItems=[
+                    {
+                        'Put': {
+                            'TableName': ACTUATOR_TABLE_NAME,
+                            'Item': to_dynamodb(command),
+                            'ConditionExpression': 'attribute_not_exists(#ts)',
+                            'ExpressionAttributeNames': {'#ts': 'timestamp'}
+                        }
+                    }
+                    for command in commands
+                ]
+            )
+        
+        for command in commands:
+            logger.info("✅ Stored command: %s -> %s", command['actuator'], command['state'])
+        return commands
     except Exception as e:
-        print(f"❌ Error storing command: {e}")
-        return None
+        logger.error("❌ Error storing command: %s", e)
+        return []
 
 
-def make_actuator_decisions(greenhouse_id):
+def make_actuator_decisions(greenhouse_id, thresholds=None):
     """
     Get latest sensor reading and make actuator decisions
+    Pass thresholds to reuse values already loaded by the caller
     Returns: list of commands sent
     """
-    # Load current thresholds from DynamoDB (fresh on every call)
-    THRESHOLDS = load_thresholds()
-    print(f"🔧 Using thresholds from DB: {THRESHOLDS}")
+    # Load current thresholds (cached per container) unless provided
+    THRESHOLDS = thresholds if thresholds is not None else load_thresholds()
+    logger.debug("🔧 Using thresholds from DB: %s", THRESHOLDS)
     
-    # Get latest sensor reading
-    latest = get_latest_reading(greenhouse_id)
+    # Get latest sensor reading and last pump/fan states concurrently
+    # (three independent queries - wait one round-trip instead of three)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        latest_future = executor.submit(get_latest_reading, greenhouse_id)
+        pump_future = executor.submit(get_last_actuator_state, greenhouse_id, 'water_pump')
+        fan_future = executor.submit(get_last_actuator_state, greenhouse_id, 'cooling_fan')
+    
+    latest = latest_future.result()
+    pump_status = pump_future.result()
+    fan_status = fan_future.result()
     
     if not latest or 'sensors' not in latest:
         return {'error': 'No sensor data available', 'commands': []}
     
+    # Greenhouse has sensor data - make sure the registry lists it
+    register_greenhouse(greenhouse_id)
+    
     sensors = latest['sensors']
     soil_moisture = float(sensors.get('soil_moisture', {}).get('value', 50))
     temperature = float(sensors.get('temperature', {}).get('value', 25))
     
-    commands_sent = []
+    # Commands to store, written together after both decisions. Pump and fan
+    # share a greenhouse partition, so their timestamps must differ.
+    pending_commands = []
+    command_time = to_epoch_ms(utc_now())
     
     # ==========================================
     # WATER PUMP CONTROL
     # ==========================================
-    pump_status = get_last_actuator_state(greenhouse_id, 'water_pump')
     pump_current_state = pump_status['state']
     pump_new_state = pump_current_state
     pump_reason = ''
     
-    print(f"💧 Water Pump Decision: soil={soil_moisture}%, current_state={pump_current_state}")
-    print(f"   Thresholds: turn_on<{THRESHOLDS['soil_moisture']['turn_on']}%, turn_off>{THRESHOLDS['soil_moisture']['turn_off']}%")
+    logger.debug("💧 Water Pump Decision: soil=%s%%, current_state=%s", soil_moisture, pump_current_state)
+    logger.debug(
+        "   Thresholds: turn_on<%s%%, turn_off>%s%%",
+        THRESHOLDS['soil_moisture']['turn_on'],
+        THRESHOLDS['soil_moisture']['turn_off']
+    )
     
     if soil_moisture < THRESHOLDS['soil_moisture']['turn_on']:
         pump_new_state = 'ON'
         pump_reason = f'Soil moisture low: {soil_moisture}% (threshold: {THRESHOLDS["soil_moisture"]["turn_on"]}%)'
-        print(f"   → Decision: Turn ON (soil below turn_on threshold)")
+        logger.debug("   → Decision: Turn ON (soil below turn_on threshold)")
     elif soil_moisture >= THRESHOLDS['soil_moisture']['turn_off']:
         pump_new_state = 'OFF'
         pump_reason = f'Soil moisture sufficient: {soil_moisture}% (threshold: {THRESHOLDS["soil_moisture"]["turn_off"]}%)'
-        print(f"   → Decision: Turn OFF (soil above turn_off threshold)")
+        logger.debug("   → Decision: Turn OFF (soil above turn_off threshold)")
     else:
         pump_reason = f'Soil moisture in range: {soil_moisture}% - maintaining {pump_current_state}'
-        print(f"   → Decision: Maintain {pump_current_state} (soil in maintenance range)")
+        logger.debug("   → Decision: Maintain %s (soil in maintenance range)", pump_current_state)
     
     # Only store command if state changes
     if pump_new_state != pump_current_state:
-        print(f"   ✅ State changed! Storing command: {pump_current_state} → {pump_new_state}")
-        cmd = store_actuator_command(
+        logger.debug("   ✅ State changed! Storing command: %s → %s", pump_current_state, pump_new_state)
+        pending_commands.append(build_actuator_command(
             greenhouse_id, 
             'water_pump', 
             pump_new_state, 
             pump_reason,
-            {'soil_moisture': soil_moisture}
-        )
-        if cmd:
-            commands_sent.append(cmd)
+            {'soil_moisture': soil_moisture},
+            timestamp=command_time
+        ))
     else:
-        print(f"   ⏸️  No state change - no command stored")
+        logger.debug("   ⏸️  No state change - no command stored")
     
     # ==========================================
     # COOLING FAN CONTROL
     # ==========================================
-    fan_status = get_last_actuator_state(greenhouse_id, 'cooling_fan')
     fan_current_state = fan_status['state']
     fan_current_speed = fan_status['speed']
     fan_new_state = fan_current_state
     fan_new_speed = fan_current_speed
     fan_reason = ''
     
-    print(f"🌡️  Cooling Fan Decision: temp={temperature}°C, current_state={fan_current_state}@{fan_current_speed}")
-    print(f"   Thresholds: LOW>{THRESHOLDS['temperature']['turn_on_low']}°C, HIGH>{THRESHOLDS['temperature']['turn_on_high']}°C, OFF<{THRESHOLDS['temperature']['turn_off']}°C")
+    logger.debug(
+        "🌡️  Cooling Fan Decision: temp=%s°C, current_state=%s@%s",
+        temperature, fan_current_state, fan_current_speed
+    )
+    logger.debug(
+        "   Thresholds: LOW>%s°C, HIGH>%s°C, OFF<%s°C",
+        THRESHOLDS['temperature']['turn_on_low'],
+        THRESHOLDS['temperature']['turn_on_high'],
+        THRESHOLDS['temperature']['turn_off']
+    )
     
     if temperature >= THRESHOLDS['temperature']['turn_on_high']:
         fan_new_state = 'ON'
@@ -387,25 +897,29 @@ def make_actuator_decisions(greenhouse_id):
     
     # Store command ONLY if state changes OR speed changes
     if fan_new_state != fan_current_state or fan_new_speed != fan_current_speed:
-        print(f"   ✅ State/Speed changed! Storing command: {fan_current_state}@{fan_current_speed} → {fan_new_state}@{fan_new_speed}")
-        cmd = store_actuator_command(
+        logger.debug(
+            "   ✅ State/Speed changed! Storing command: %s@%s → %s@%s",
+            fan_current_state, fan_current_speed, fan_new_state, fan_new_speed
+        )
+        pending_commands.append(build_actuator_command(
             greenhouse_id, 
             'cooling_fan', 
             fan_new_state, 
             fan_reason,
             {'temperature': temperature},
-            fan_new_speed
-        )
-        if cmd:
-            commands_sent.append(cmd)
+            fan_new_speed,
+            timestamp=command_time + 1
+        ))
     else:
-        print(f"   ⏸️  No state/speed change - no command stored")
+        logger.debug("   ⏸️  No state/speed change - no command stored")
+    
+    commands_sent = store_actuator_commands(pending_commands)
     
-    print(f"📊 Total commands sent: {len(commands_sent)}")
+    logger.debug("📊 Total commands sent: %d", len(commands_sent))
     
     return {
         'greenhouse_id': greenhouse_id,
-        'timestamp': latest['timestamp'],
+        'timestamp': ms_to_iso(latest['timestamp']),
         'sensor_values': {
             'soil_moisture': soil_moisture,
             'temperature': temperature
@@ -428,31 +942,44 @@ def make_actuator_decisions(greenhouse_id):
     }
 
 
-def process_all_greenhouses():
+def process_greenhouse(greenhouse_id, thresholds):
+    """Make actuator decisions for one greenhouse, capturing any error in the result"""
+    try:
+        result = make_actuator_decisions(greenhouse_id, thresholds=thresholds)
+        logger.info("✅ %s: %s commands sent", greenhouse_id, result.get('commands_sent', 0))
+        return result
+    except Exception as e:
+        logger.error("❌ Error processing %s: %s", greenhouse_id, e)
+        return {
+            'greenhouse_id': greenhouse_id,
+            'error': str(e)
+        }
+
+
+def process_all_greenhouses(now=None):
     """
     Process actuator decisions for all greenhouses
     This is called by EventBridge scheduled rule
+    
+    Greenhouses are processed in parallel threads; the work is DynamoDB
+    round-trips, so the threads overlap network waits
     """
     greenhouses = list_greenhouses()
+    thresholds = load_thresholds()
     results = []
     
-    print(f"🤖 Processing {len(greenhouses)} greenhouses...")
+    logger.info("🤖 Processing %d greenhouses...", len(greenhouses))
     
-    for greenhouse_id in greenhouses:
-        try:
-            result = make_actuator_decisions(greenhouse_id)
-            results.append(result)
-            print(f"✅ {greenhouse_id}: {result.get('commands_sent', 0)} commands sent")
-        except Exception as e:
-            print(f"❌ Error processing {greenhouse_id}: {e}")
-            results.append({
-                'greenhouse_id': greenhouse_id,
-                'error': str(e)
-            })
+    if greenhouses:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(greenhouses))) as executor:
+            results = list(executor.map(
+                lambda greenhouse_id: process_greenhouse(greenhouse_id, thresholds),
+                greenhouses
+            ))
     
     return {
         'processed': len(results),
-        'timestamp': datetime.utcnow().isoformat() + 'Z',
+        'timestamp': to_iso(now or utc_now()),
         'results': results
     }
 
@@ -479,7 +1006,7 @@ def get_actuator_status(greenhouse_id):
                 actuators[actuator_name] = {
                     'name': actuator_name,
                     'state': item.get('state', 'UNKNOWN'),
-                    'last_updated': item.get('timestamp'),
+                    'last_updated': ms_to_iso(item['timestamp']),
                     'reason': item.get('reason', ''),
                     'sensor_values': item.get('sensor_values', {})
                 }
@@ -495,35 +1022,32 @@ def get_actuator_status(greenhouse_id):
         }
     
     except Exception as e:
-        print(f"Error getting actuator status: {e}")
+        logger.error("Error getting actuator status: %s", e)
         return {'error': str(e), 'actuators': []}
 
 
-def get_actuator_history(greenhouse_id, hours=24):
+def get_actuator_history(greenhouse_id, hours=24, now=None):
     """Get history of actuator commands"""
     try:
-        end_time = datetime.utcnow()
+        end_time = now or utc_now()
         start_time = end_time - timedelta(hours=hours)
         
         result = actuator_table.query(
             KeyConditionExpression=
                 Key('greenhouse_id').eq(greenhouse_id) &
-                Key('timestamp').between(
-                    start_time.isoformat() + 'Z',
-                    end_time.isoformat() + 'Z'
-                ),
+                Key('timestamp').between(to_epoch_ms(start_time), to_epoch_ms(end_time)),
             ScanIndexForward=False
         )
         
         return {
             'greenhouse_id': greenhouse_id,
-            'commands': result.get('Items', []),
+            'commands': [with_iso_timestamp(item) for item in result.get('Items', [])],
             'count': len(result.get('Items', [])),
             'hours': hours
         }
     
     except Exception as e:
-        print(f"Error getting actuator history: {e}")
+        logger.error("Error getting actuator history: %s", e)
         return {'error': str(e), 'commands': []}
 
 
@@ -531,7 +1055,7 @@ def get_actuator_history(greenhouse_id, hours=24):
 # MANUAL CONTROL & THRESHOLDS
 # ============================================
 
-def manual_control_actuator(greenhouse_id, actuator_name, state, speed=None):
+def manual_control_actuator(greenhouse_id, actuator_name, state, speed=None, timestamp=None):
     """Manually control an actuator"""
     valid_actuators = ['water_pump', 'cooling_fan']
     valid_states = ['ON', 'OFF']
@@ -550,14 +1074,15 @@ def manual_control_actuator(greenhouse_id, actuator_name, state, speed=None):
         state, 
         reason,
         {},
-        speed
+        speed,
+        timestamp
     )
     
     if cmd:
         return {
             'success': True,
             'message': f'{actuator_name} set to {state}',
-            'command': cmd
+            'command': with_iso_timestamp(cmd)
         }
     else:
         return {'error': 'Failed to store command'}
@@ -607,6 +1132,144 @@ def update_thresholds(new_thresholds):
         return {'error': f'Failed to update thresholds: {str(e)}'}
 
 
+# ============================================
+# ROUTE HANDLERS
+# ============================================
+# Each handler takes (greenhouse_id, params, event, now) and returns a response
+
+def _handle_latest(greenhouse_id, params, event, now):
+    """Get most recent sensor reading"""
+    data = get_latest_reading(greenhouse_id)
+    if data:
+        return response(200, with_iso_timestamp(data))
+    return response(404, {'error': 'No data found'})
+
+
+def _handle_history(greenhouse_id, params, event, now):
+    """Get sensor readings history"""
+    hours = int(params.get('hours', 6))
+    hours = min(hours, 168)
+    data = [with_iso_timestamp(item) for item in get_readings_history(greenhouse_id, hours, now)]
+    return response(200, {'readings': data, 'count': len(data)})
+
+
+def _handle_stats(greenhouse_id, params, event, now):
+    """Get sensor statistics"""
+    hours = int(params.get('hours', 24))
+    hours = min(hours, 168)
+    data = get_statistics(greenhouse_id, hours, now)
+    if data:
+        return response(200, data)
+    return response(404, {'error': 'No data found'})
+
+
+def _handle_alerts(greenhouse_id, params, event, now):
+    """Get recent alerts"""
+    limit = int(params.get('limit', 10))
+    data = get_recent_alerts(greenhouse_id, limit, now)
+    return response(200, {'alerts': data, 'count': len(data)})
+
+
+def _handle_greenhouses(greenhouse_id, params, event, now):
+    """List all greenhouses"""
+    data = list_greenhouses()
+    return response(200, {'greenhouses': data})
+
+
+def _handle_actuator_status(greenhouse_id, params, event, now):
+    """Get current actuator status"""
+    data = get_actuator_status(greenhouse_id)
+    return response(200, data)
+
+
+def _handle_actuator_history(greenhouse_id, params, event, now):
+    """Get actuator command history"""
+    hours = int(params.get('hours', 24))
+    data = get_actuator_history(greenhouse_id, hours, now)
+    return response(200, data)
+
+
+def _handle_actuator_control(greenhouse_id, params, event, now):
+    """Manually trigger control logic for one greenhouse"""
+    data = make_actuator_decisions(greenhouse_id)
+    return response(200, data)
+
+
+def _handle_actuator_manual(greenhouse_id, params, event, now):
+    """Manual actuator control"""
+    try:
+        body = json.loads(event.get('body', '{}'))
+        actuator = body.get('actuator')
+        state = body.get('state')
+        speed = body.get('speed')
+        
+        if not actuator or not state:
+            return response(400, {'error': 'Missing actuator or state'})
+        
+        data = manual_control_actuator(greenhouse_id, actuator, state, speed, to_epoch_ms(now))
+        return response(200, data)
+    except json.JSONDecodeError:
+        return response(400, {'error': 'Invalid JSON in request body'})
+
+
+def _handle_get_thresholds(greenhouse_id, params, event, now):
+    """Get current thresholds"""
+    data = get_thresholds()
+    return response(200, {'thresholds': data})
+
+
+def _handle_update_thresholds(greenhouse_id, params, event, now):
+    """Update thresholds"""
+    try:
+        body = json.loads(event.get('body', '{}'))
+        data = update_thresholds(body)
+        return response(200, data)
+    except json.JSONDecodeError:
+        return response(400, {'error': 'Invalid JSON in request body'})
+
+
+def _handle_health(greenhouse_id, params, event, now):
+    """Health check"""
+    return response(200, {
+        'service': 'Smart GreenHouse API',
+        'status': 'healthy',
+        'version': '2.0-with-automatic-actuators',
+        'endpoints': {
+            'sensors': ['/latest', '/history', '/stats', '/alerts', '/greenhouses'],
+            'actuators': [
+                '/actuators/status',
+                '/actuators/history', 
+                '/actuators/control (POST)',
+                '/actuators/manual (POST)',
+                '/actuators/thresholds'
+            ]
+        },
+        'automation': 'EventBridge scheduled every 5 minutes'
+    })
+
+
+# (method, path) -> handler
+ROUTES = {
+    # Sensor data endpoints
+    ('GET', '/latest'): _handle_latest,
+    ('GET', '/history'): _handle_history,
+    ('GET', '/stats'): _handle_stats,
+    ('GET', '/alerts'): _handle_alerts,
+    ('GET', '/greenhouses'): _handle_greenhouses,
+    
+    # Actuator control endpoints
+    ('GET', '/actuators/status'): _handle_actuator_status,
+    ('GET', '/actuators/history'): _handle_actuator_history,
+    ('POST', '/actuators/control'): _handle_actuator_control,
+    ('POST', '/actuators/manual'): _handle_actuator_manual,
+    ('GET', '/actuators/thresholds'): _handle_get_thresholds,
+    ('POST', '/actuators/thresholds'): _handle_update_thresholds,
+    
+    # Health check
+    ('GET', '/'): _handle_health,
+}
+
+
 # ============================================
 # MAIN HANDLER
 # ============================================
@@ -618,25 +1281,27 @@ def lambda_handler(event, context):
     EventBridge invokes this function every 5 minutes to process actuators
     API Gateway invokes it for dashboard requests
     """
+    # One clock read per invocation, passed down to every handler
+    now = utc_now()
     
     # Debug logging for all invocations
-    print("=" * 60)
-    print(f"🔍 Lambda Invoked at {datetime.utcnow().isoformat()}Z")
-    print(f"   Event source: {event.get('source', 'NOT_SET')}")
-    print(f"   Detail-type: {event.get('detail-type', 'NOT_SET')}")
-    print(f"   HTTP method: {event.get('httpMethod', 'NOT_SET')}")
-    print(f"   Path: {event.get('path', 'NOT_SET')}")
-    print("=" * 60)
+    logger.debug(
+        "🔍 Lambda Invoked at %s: source=%s, detail-type=%s, method=%s, path=%s",
+        now,
+        event.get('source', 'NOT_SET'),
+        event.get('detail-type', 'NOT_SET'),
+        event.get('httpMethod', 'NOT_SET'),
+        event.get('path', 'NOT_SET')
+    )
     
     # Check if this is an EventBridge scheduled event
     if event.get('source') == 'aws.events':
-        print("🤖 EventBridge scheduled actuator processing triggered")
-        print(f"   Event detail-type: {event.get('detail-type')}")
-        result = process_all_greenhouses()
-        print(f"✅ EventBridge processing complete: {result.get('processed', 0)} greenhouses")
+        logger.info("🤖 EventBridge scheduled actuator processing triggered (%s)", event.get('detail-type'))
+        result = process_all_greenhouses(now)
+        logger.info("✅ EventBridge processing complete: %s greenhouses", result.get('processed', 0))
         return {
             'statusCode': 200,
-            'body': json.dumps(result, default=decimal_default)
+            'body': to_json(result)
         }
     
     # Handle CORS preflight
@@ -651,115 +1316,11 @@ def lambda_handler(event, context):
     greenhouse_id = params.get('greenhouse_id', 'greenhouse-01')
     
     try:
-        # ==========================================
-        # SENSOR DATA ENDPOINTS
-        # ==========================================
-        
-        if path == '/latest' and method == 'GET':
-            data = get_latest_reading(greenhouse_id)
-            if data:
-                return response(200, data)
-            return response(404, {'error': 'No data found'})
-        
-        elif path == '/history' and method == 'GET':
-            hours = int(params.get('hours', 6))
-            hours = min(hours, 168)
-            data = get_readings_history(greenhouse_id, hours)
-            return response(200, {'readings': data, 'count': len(data)})
-        
-        elif path == '/stats' and method == 'GET':
-            hours = int(params.get('hours', 24))
-            data = get_statistics(greenhouse_id, hours)
-            if data:
-                return response(200, data)
-            return response(404, {'error': 'No data found'})
-        
-        elif path == '/alerts' and method == 'GET':
-            limit = int(params.get('limit', 10))
-            data = get_recent_alerts(greenhouse_id, limit)
-            return response(200, {'alerts': data, 'count': len(data)})
-        
-        elif path == '/greenhouses' and method == 'GET':
-            data = list_greenhouses()
-            return response(200, {'greenhouses': data})
-        
-        # ==========================================
-        # ACTUATOR CONTROL ENDPOINTS
-        # ==========================================
-        
-        elif path == '/actuators/status' and method == 'GET':
-            """Get current actuator status"""
-            data = get_actuator_status(greenhouse_id)
-            return response(200, data)
-        
-        elif path == '/actuators/history' and method == 'GET':
-            """Get actuator command history"""
-            hours = int(params.get('hours', 24))
-            data = get_actuator_history(greenhouse_id, hours)
-            return response(200, data)
-        
-        elif path == '/actuators/control' and method == 'POST':
-            """Manually trigger control logic for one greenhouse"""
-            data = make_actuator_decisions(greenhouse_id)
-            return response(200, data)
-        
-        elif path == '/actuators/manual' and method == 'POST':
-            """Manual actuator control"""
-            try:
-                body = json.loads(event.get('body', '{}'))
-                actuator = body.get('actuator')
-                state = body.get('state')
-                speed = body.get('speed')
-                
-                if not actuator or not state:
-                    return response(400, {'error': 'Missing actuator or state'})
-                
-                data = manual_control_actuator(greenhouse_id, actuator, state, speed)
-                return response(200, data)
-            except json.JSONDecodeError:
-                return response(400, {'error': 'Invalid JSON in request body'})
-        
-        elif path == '/actuators/thresholds' and method == 'GET':
-            """Get current thresholds"""
-            data = get_thresholds()
-            return response(200, {'thresholds': data})
-        
-        elif path == '/actuators/thresholds' and method == 'POST':
-            """Update thresholds"""
-            try:
-                body = json.loads(event.get('body', '{}'))
-                data = update_thresholds(body)
-                return response(200, data)
-            except json.JSONDecodeError:
-                return response(400, {'error': 'Invalid JSON in request body'})
-        
-        # ==========================================
-        # HEALTH CHECK
-        # ==========================================
-        
-        elif path == '/' and method == 'GET':
-            return response(200, {
-                'service': 'Smart GreenHouse API',
-                'status': 'healthy',
-                'version': '2.0-with-automatic-actuators',
-                'endpoints': {
-                    'sensors': ['/latest', '/history', '/stats', '/alerts', '/greenhouses'],
-                    'actuators': [
-                        '/actuators/status',
-                        '/actuators/history', 
-                        '/actuators/control (POST)',
-                        '/actuators/manual (POST)',
-                        '/actuators/thresholds'
-                    ]
-                },
-                'automation': 'EventBridge scheduled every 5 minutes'
-            })
-        
-        else:
-            return response(404, {'error': f'Unknown endpoint: {method} {path}'})
+        handler = ROUTES.get((method, path))
+        if handler:
+            return handler(greenhouse_id, params, event, now)
+        return response(404, {'error': f'Unknown endpoint: {method} {path}'})
     
     except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return response(500, {'error': str(e)})
\ No newline at end of file
+        logger.exception("Error: %s", e)
+        return response(500, {'error': str(e)})
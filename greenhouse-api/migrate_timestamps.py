@@ -0,0 +1,96 @@
+"""
+Smart GreenHouse - Timestamp Sort Key Migration
+
+Copies a table whose 'timestamp' sort key is an ISO string
+(2026-01-01T12:00:00.000000Z) into a new table whose 'timestamp' sort key is
+a Number of epoch milliseconds, as used by the API handler.
+
+- Sensor readings and actuator commands: ISO timestamp -> epoch ms
+- Actuator commands also get gh_act ("{greenhouse_id}#{actuator}") for gsi_actuator
+- __CONFIG__ / __REGISTRY__ items: 'thresholds' / 'greenhouses' -> 0
+- Two items of one greenhouse that fall on the same millisecond are kept by
+  moving the later one forward 1 ms
+
+The source table is only read. Safe to re-run: it rewrites the same keys.
+
+Usage:
+    python migrate_timestamps.py greenhouse-sensor-data greenhouse-sensor-data-v2
+    python migrate_timestamps.py greenhouse-actuator-commands greenhouse-actuator-commands-v2
+"""
+
+import argparse
+import boto3
+from datetime import datetime, timezone
+
+# Sort keys of the special items in the actuator table
+SPECIAL_SORT_KEYS = {
+    'thresholds': 0,
+    'greenhouses': 0
+}
+
+
+def iso_to_epoch_ms(value):
+    """ISO timestamp string ('...Z' or '+00:00', UTC) -> epoch milliseconds"""
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def convert_item(item):
+    """Copy of an old item in the new key format"""
+    item = dict(item)
+    timestamp = item['timestamp']
+    
+    if timestamp in SPECIAL_SORT_KEYS:
+        item['timestamp'] = SPECIAL_SORT_KEYS[timestamp]
+    else:
+        item['timestamp'] = iso_to_epoch_ms(timestamp)
+    
+    if 'actuator' in item:
+        item['gh_act'] = f"{item['greenhouse_id']}#{item['actuator']}"
+    
+    return item
+
+
+def migrate(source_name, target_name):
+    """Scan source table and write every item, converted, to target table"""
+    dynamodb = boto3.resource('dynamodb')
+    source = dynamodb.Table(source_name)
+    target = dynamodb.Table(target_name)
+    
+    used_keys = set()
+    copied = 0
+    scan_kwargs = {}
+    
+    with target.batch_writer() as batch:
+        while True:
+            result = source.scan(**scan_kwargs)
+            
+            for item in result['Items']:
+                new_item = convert_item(item)
+                
+                # Sub-millisecond neighbours (e.g. pump + fan command) must not collide
+                while (new_item['greenhouse_id'], new_item['timestamp']) in used_keys:
+                    new_item['timestamp'] += 1
+                used_keys.add((new_item['greenhouse_id'], new_item['timestamp']))
+                
+                batch.put_item(Item=new_item)
+                copied += 1
+            
+            print(f"   ... {copied} items copied")
+            if 'LastEvaluatedKey' not in result:
+                break
+            scan_kwargs['ExclusiveStartKey'] = result['LastEvaluatedKey']
+    
+    print(f"✅ Migrated {copied} items: {source_name} → {target_name}")
+    return copied
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert ISO timestamp sort keys to epoch milliseconds')
+    parser.add_argument('source', help='Table with ISO string timestamps')
+    parser.add_argument('target', help='New table with Number (epoch ms) timestamps')
+    args = parser.parse_args()
+    
+    migrate(args.source, args.target)